@@ -63,10 +63,14 @@ class Visitor:
             functions which have to be handled after the first function in callstack has
             been done. The second list in the queue includes the functions which have to
             be handled after the second function in the callstack has been done...
+        depths (dict[int, int]):
+            The index of the first occurrence of each function in callstack by the id()
+            of the function. It is kept in step with callstack.
     """
 
     callstack = []
     queue = [[]]
+    depths = {}
 
     def __init__(self, entrances=None):
         """Create the object.
@@ -79,9 +83,11 @@ class Visitor:
         if entrances:
             self.callstack = [entrances[-1]]
             self.queue = [entrances[:-1]]
+            self.depths = {id(entrances[-1]): 0}
         else:
             self.callstack = []
             self.queue = [[]]
+            self.depths = {}
 
     def __eq__(self, other):
         """Return self.callstack == other.callstack and self.queue == other.queue."""
@@ -91,6 +97,26 @@ class Visitor:
         """Return self.callstack != other.callstack or self.queue != other.queue."""
         return not self.__eq__(other)
 
+    def _push(self, function):
+        self.depths.setdefault(id(function), len(self.callstack))
+        self.callstack.append(function)
+
+    def _pop(self):
+        function = self.callstack.pop()
+        if self.depths.get(id(function)) == len(self.callstack):
+            del self.depths[id(function)]
+
+    def depth(self, function):
+        """Return the index of the first occurrence of the function in callstack.
+
+        Args:
+            function (Stack.Function): the function
+
+        Returns:
+            int: the index in callstack or None if the function is not in callstack
+        """
+        return self.depths.get(id(function))
+
     def down(self):
         """Walk to a leaf of the current sub-tree.
 
@@ -108,10 +134,10 @@ class Visitor:
             next_call = calls.pop()
 
             if next_call in self.callstack:
-                self.callstack.append(next_call)
+                self._push(next_call)
                 break
 
-            self.callstack.append(next_call)
+            self._push(next_call)
 
             # FIXME: Always add this, to make it more consequent and the algorithm would
             # have less side effects to handle...
@@ -135,13 +161,13 @@ class Visitor:
                             otherwise the parent node.
         """
         if self.callstack:
-            self.callstack.pop()
+            self._pop()
 
         tier = len(self.callstack)
 
         if tier < len(self.queue):
             if self.queue[tier]:
-                self.callstack.append(self.queue[tier].pop())
+                self._push(self.queue[tier].pop())
 
             # FIXME: If we always empty lists in down(), we always have to delete it
             # here, too
@@ -178,15 +204,24 @@ class Stack:
             statistic[StackImpact.Weak] (int):
                 the number of instructions which increase the stack, but the stack
                 increase can't be calculated
+            total_impacts (int):
+                the number of all instructions, which is the sum of per_stack_impact
         """
 
-        per_operations = {}
-        per_stack_impact = {
-            StackImpact.No: 0,
-            StackImpact.Clear: 0,
-            StackImpact.Potential: 0,
-            StackImpact.Weak: 0,
-        }
+        per_operations = None
+        per_stack_impact = None
+        total_impacts = 0
+
+        def __init__(self):
+            """Create the object."""
+            self.per_operations = {}
+            self.per_stack_impact = {
+                StackImpact.No: 0,
+                StackImpact.Clear: 0,
+                StackImpact.Potential: 0,
+                StackImpact.Weak: 0,
+            }
+            self.total_impacts = 0
 
         def add_operation(self, operation, stack_impact):
             """Add an operation to the statistics.
@@ -204,6 +239,28 @@ class Stack:
                 self.per_operations[operation] = OperationStatistic(1, stack_impact)
 
             self.per_stack_impact[stack_impact] += 1
+            self.total_impacts += 1
+
+        def add_operations(self, operations):
+            """Add counted operations to the statistics at once.
+
+            Args:
+                operations (dict[(str, StackImpact), int]):
+                    the number of executions of each instruction per status of the
+                    stack operation
+            """
+            for (operation, stack_impact), executions in operations.items():
+                if operation in self.per_operations:
+                    self.per_operations[operation].executions += executions
+                    if stack_impact > self.per_operations[operation].stack_impact:
+                        self.per_operations[operation].stack_impact = stack_impact
+                else:
+                    self.per_operations[operation] = OperationStatistic(
+                        executions, stack_impact
+                    )
+
+                self.per_stack_impact[stack_impact] += executions
+                self.total_impacts += executions
 
     class Function:
         """A function of a binary.
@@ -230,19 +287,21 @@ class Stack:
             section (str):         the section the function is defined
         """
 
-        address = None
-        name = None
-        file = ""
-        size = None
-        total = 0
-        dynamic = False
-        imprecise = False
-        cycle = False
-        calls = None
-        returns = None
-        visited = False
-        # lock = False
-        section = None
+        # There are many functions in a binary, so don't give each one a __dict__
+        __slots__ = (
+            "address",
+            "name",
+            "file",
+            "size",
+            "total",
+            "dynamic",
+            "imprecise",
+            "cycle",
+            "calls",
+            "returns",
+            "visited",
+            "section",
+        )
 
         def __init__(self, address, name=None, section=None, file="", size=0):
             """Create the object.
@@ -267,8 +326,13 @@ class Stack:
             self.section = section
             self.file = file
             self.size = size
+            self.total = 0
+            self.dynamic = False
+            self.imprecise = False
+            self.cycle = False
             self.calls = Stack.Table([])
             self.returns = Stack.Table([])
+            self.visited = False
 
         def __lt__(self, other):
             """Return self.address < other.address."""
@@ -284,9 +348,14 @@ class Stack:
 
         def __eq__(self, other):
             """Return self.address == other.address."""
-            if self.file == other.file:
-                return self.address == other.address
-            return self.file == other.file
+            # The same function is compared most often, e.g. by the Visitor
+            if self is other:
+                return True
+            return self.file == other.file and self.address == other.address
+
+        def __hash__(self):
+            """Return hash(self.address)."""
+            return hash(self.address)
 
         def __le__(self, other):
             """Return self.address <= other.address."""
@@ -388,6 +457,17 @@ class Stack:
 
             return None
 
+        def remove(self, functions):
+            """Remove several functions in a single pass.
+
+            Args:
+                functions (list(Stack.Function)): the functions to remove
+            """
+            removed = {id(function) for function in functions}
+            self.table[:] = [
+                function for function in self.table if id(function) not in removed
+            ]
+
         def sort(self):
             """Sort the functions by Stack.Function.total with the largest value first."""
             self.table.sort(key=lambda node: node.total, reverse=True)
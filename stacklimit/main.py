@@ -7,6 +7,8 @@
 """The entrance point when executing the tool from a shell."""
 
 import argparse
+import sys
+from os import environ
 
 from stacklimit import Stacklimit
 
@@ -185,6 +187,12 @@ def main():
     parser.add_argument("-a", "--arch", help="the architecture of the target platform")
     parser.add_argument("-c", "--no-color", action="store_true", help="suppress color")
     parser.add_argument("-o", "--objdump", help="path to or name of the objdump")
+    parser.add_argument(
+        "--cache-dir",
+        help="directory to store parsed binaries in to skip parsing them again "
+        "(only use a directory no one else can write to, since loading a cache can "
+        "run arbitrary code)",
+    )
     parser.add_argument(
         "-r",
         "--regard-all",
@@ -227,7 +235,8 @@ def main():
 
     warn = not args.no_warnings
     multiple_warn = not args.no_duplicated_warnings
-    color = not args.no_color
+    # Only color the output for a terminal and respect https://no-color.org
+    color = not args.no_color and sys.stdout.isatty() and not environ.get("NO_COLOR")
 
     try:
         stacklimit = Stacklimit(
@@ -246,7 +255,7 @@ def main():
 
     try:
         # TODO: Handle multiple binaries
-        stacklimit.parse(args.binary.name)
+        stacklimit.parse(args.binary.name, args.cache_dir)
         precise = stacklimit.calculate_stack()
         limit = stacklimit.get_stack_limit()
 
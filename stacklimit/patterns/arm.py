@@ -25,7 +25,7 @@ class arm(Pattern):
     arch = ["arm"]
 
     # Stack pointer
-    sp = "(w|)sp"
+    sp = "w?sp"
 
     # General purpose 4 byte (integer) registers
     # Ignore the "zero" register w31, since it won't influence the stack
@@ -7,6 +7,9 @@
 import re
 from abc import ABC, abstractmethod
 
+# The instruction name is the first word behind the address and the opcode bytes
+_match_operation = re.compile(r"^\s+[0-9a-f]+:\s+([0-9a-f]+ )+\s+(\S*)").match
+
 
 class Pattern(ABC):
     """Contain instruction sets for different kind of calls.
@@ -14,6 +17,8 @@ class Pattern(ABC):
     Attributes:
         arch (list[str]):         the supported architectures
         os_functions (list[str]): OS functions, e.g. for initialization and termination
+        mnemonics (list[str]):    literals of which each instruction pattern match
+                                  contains at least one, None if there are none
         FileFormat (str):         regex of the file format line
         Section (str):            regex of sections
         Function (str):           regex of functions
@@ -46,6 +51,7 @@ class Pattern(ABC):
         "__libc_start_main@plt",
         "__gmon_start__@plt",
     ]
+    mnemonics = None
 
     # dir/binary:     file format elf64-x86-64
     FileFormat = "^.*:( |\t)*file format "
@@ -127,13 +133,10 @@ class Pattern(ABC):
         Returns:
             str: the instruction name
         """
-        prefix = re.match("^\s+[0-9a-f]+:\s+([0-9a-f]+ )+\s+", line)
+        match = _match_operation(line)
 
-        if prefix:
-            start = prefix.span()[1]
-            # print(line[start:])
-            # print(re.split("\s", line[start:])[0])
-            return re.split("\s", line[start:])[0]
+        if match:
+            return match.group(2)
 
         return None
 
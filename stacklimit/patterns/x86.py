@@ -20,13 +20,16 @@ class x86(Pattern):
 
     arch = ["x86"]
 
+    # Every instruction pattern contains one of these instructions
+    mnemonics = ["call", "enter", "fdecstp", "pop", "push", "sub"]
+
     # Stack pointer
-    sp = "(e|r|l|)sp"
+    sp = "[erl]?sp"
 
     # General purpose 1 byte (integer) registers
     reg1byte = (
         # fmt: off
-          "(" + "(a|b|c|d)(h|l)"
+          "(" + "[abcd][hl]"
         + "|" + "(bp|si|di|sp)l"
         + "|" + "r(8|9|10|11|12|13|14|15)b"
         + ")"
@@ -36,7 +39,7 @@ class x86(Pattern):
     # General purpose 2 byte (integer) registers
     reg2bytes = (
         # fmt: off
-          "(" + "(a|b|c|d)x"
+          "(" + "[abcd]x"
         + "|" + "bp|si|di|sp"
         + "|" + "r(8|9|10|11|12|13|14|15)w"
         + ")"
@@ -46,7 +49,7 @@ class x86(Pattern):
     # General purpose 4 byte (integer) registers
     reg4bytes = (
         # fmt: off
-          "(" + "e(a|b|c|d)x"
+          "(" + "e[abcd]x"
         + "|" + "e(bp|si|di|sp)"
         + "|" + "r(8|9|10|11|12|13|14|15)d"
         + ")"
@@ -56,7 +59,7 @@ class x86(Pattern):
     # General purpose 8 byte (integer) registers
     reg8bytes = (
         # fmt: off
-          "(" + "r(a|b|c|d)x"
+          "(" + "r[abcd]x"
         + "|" + "r(bp|si|di|sp)"
         + "|" + "r(8|9|10|11|12|13|14|15)"
         + ")"
@@ -65,11 +68,11 @@ class x86(Pattern):
 
     #   400734:       e8 b0 fe ff ff          call   4005e9 <function_e>
     #   400734:       e8 b0 fe ff ff          callq  4005e9 <function_e>
-    FunctionCall = Pattern._operation("call(q|)", "[0-9a-f]+ \<.*\>$")
+    FunctionCall = Pattern._operation("callq?", "[0-9a-f]+ \<.*\>$")
 
     #   400804:   ff d0                   call   *%rax
     #   400804:   ff d0                   callq  *%rax
-    FunctionPointer = Pattern._operation("call(q|)", ".*%.*$")
+    FunctionPointer = Pattern._operation("callq?", ".*%.*$")
 
     #   XXXXXX:   YY YY YY YY             add     0xff,%rsp
     #   XXXXXX:   YY YY YY YY             sub     0xef,%rsp
@@ -90,7 +93,7 @@ class x86(Pattern):
     # * pushf   push EFLAGS register onto the stack
     # * pushfd  push EFLAGS register onto the stack
     # * pushfq  push EFLAGS register onto the stack
-    StackPushOp = Pattern._operation("push(l|)( |\t)+")
+    StackPushOp = Pattern._operation("pushl?[ \t]+")
 
     #   4004aa:   48 83 ec 10             sub    $0x10,%rsp
     # TODO:
@@ -139,13 +142,13 @@ class x86(Pattern):
     @staticmethod
     def _get_stack_push_size(line):
         """Calculate how many bytes the stack will grow depending on the register."""
-        if re.match(".*( |\t)+%{}$".format(x86.reg8bytes), line):
+        if re.match(".*[ \t]+%{}$".format(x86.reg8bytes), line):
             return 8
-        elif re.match(".*( |\t)+%{}$".format(x86.reg4bytes), line):
+        elif re.match(".*[ \t]+%{}$".format(x86.reg4bytes), line):
             return 4
-        elif re.match(".*( |\t)+%{}$".format(x86.reg2bytes), line):
+        elif re.match(".*[ \t]+%{}$".format(x86.reg2bytes), line):
             return 2
-        elif re.match(".*( |\t)+%{}$".format(x86.reg1byte), line):
+        elif re.match(".*[ \t]+%{}$".format(x86.reg1byte), line):
             return 1
         else:  # constant
             return 0
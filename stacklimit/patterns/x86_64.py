@@ -20,7 +20,7 @@ class x86_64(x86):
 
     #   4004c3:   55                      push   %esp
     #   4004c3:   55                      pushq  %rbp
-    StackPushOp = Pattern._operation("push(q|)( |\t)+")
+    StackPushOp = Pattern._operation("pushq?[ \t]+")
 
     @staticmethod
     def get_stack_call_size(line):
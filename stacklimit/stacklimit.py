@@ -5,18 +5,40 @@
 """Determine the maximum stack size of a binary program using the ELF format."""
 
 
+import hashlib
+import pickle
 import re
 import subprocess
-from cmath import log
-from os import environ, listdir
-from os.path import isfile
-
-from datastructure import Stack, StackImpact, Visitor
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
+from os import environ, getpid, listdir, makedirs, replace
+from os.path import abspath, dirname, getmtime, isfile, join
+from typing import NamedTuple
+
+from datastructure import OperationStatistic, Stack, StackImpact, Visitor
 from output import Color, Message
 from patterns import Pattern, aarch64, arm, x86, x86_64
 
 PATH = [path + "/" for path in ["."] + environ["PATH"].split(":")]
 
+# The number of bytes read at once from the output of objdump
+CHUNK_SIZE = 1 << 20
+
+# Increment this if the data stored in the cache changes. Changes of the sources of the
+# tool, like the patterns, invalidate the cache anyway.
+CACHE_VERSION = 1
+
+# The instruction patterns of Pattern in the order they are checked
+INSTRUCTIONS = [
+    "StackPushOp",
+    "StackSubOp",
+    "StackDynamicOp",
+    "FunctionCall",
+    "FunctionPointer",
+    "PotentialStackOp",
+]
+
 
 def get_arch(arch):
     """Determine the architecture.
@@ -47,7 +69,217 @@ def get_arch(arch):
     return None
 
 
-class Statistic:
+def _compile_match(regex):
+    """Compile the regex once and return its match method.
+
+    Args:
+        regex (str): the regex, which may be None if the pattern is not available
+
+    Returns:
+        callable: the match method of the compiled regex or None
+    """
+    if not regex:
+        return None
+
+    return re.compile(regex).match
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern):
+    """Compile the regexes of the pattern once.
+
+    All instruction patterns are combined into one regex. The alternatives are tried
+    in the order of INSTRUCTIONS and the group name tells which one has matched.
+
+    The mnemonics of the pattern are combined into a regex as well. Searching them is
+    much cheaper than the instruction regex and rules out most lines.
+
+    Args:
+        pattern (type[Pattern]): the pattern of the architecture
+
+    Returns:
+        (callable, callable, callable, callable, callable):
+            the match methods of the file format, the section, the function and the
+            instructions and the search method of the mnemonics
+    """
+    match_instruction = _compile_match(
+        "|".join(
+            "(?P<{}>{})".format(kind, getattr(pattern, kind))
+            for kind in INSTRUCTIONS
+            if getattr(pattern, kind)
+        )
+    )
+
+    search_mnemonic = None
+    if pattern.mnemonics:
+        search_mnemonic = re.compile("|".join(map(re.escape, pattern.mnemonics))).search
+
+    return (
+        _compile_match(pattern.FileFormat),
+        _compile_match(pattern.Section),
+        _compile_match(pattern.Function),
+        match_instruction,
+        search_mnemonic,
+    )
+
+
+def _read_lines(stream):
+    """Read a binary stream chunk by chunk and split it into decoded lines.
+
+    Decoding whole chunks is much cheaper than decoding each line on its own.
+
+    Args:
+        stream (io.BufferedReader): the binary stream
+
+    Yields:
+        str: the next line without the line break
+    """
+    rest = b""
+
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        chunk = rest + chunk
+        end = chunk.rfind(b"\n") + 1
+        rest = chunk[end:]
+        if end:
+            yield from chunk[: end - 1].decode("utf-8").split("\n")
+
+    if rest:
+        yield rest.decode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _run_cached(cmd, mtimes):
+    """Run the command and cache its result for the modification times.
+
+    Args:
+        cmd (tuple[str]):             the command and its arguments
+        mtimes (tuple[float | None]): the modification time of each argument
+
+    Returns:
+        (int, str): the return code and the standard output of the command
+    """
+    process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    return process.returncode, process.stdout.decode("utf-8")
+
+
+def _run(*cmd):
+    """Run the command unless it already ran with the same unchanged files.
+
+    The tools and binaries in the command are identified by their modification
+    times, so that a changed file is examined again.
+
+    Args:
+        cmd (str): the command and its arguments
+
+    Returns:
+        (int, str): the return code and the standard output of the command
+    """
+    mtimes = []
+    for arg in cmd:
+        try:
+            mtimes.append(getmtime(arg))
+        except OSError:
+            mtimes.append(None)
+
+    return _run_cached(cmd, tuple(mtimes))
+
+
+@lru_cache(maxsize=None)
+def _get_source_digest():
+    """Hash the sources of the tool including the patterns.
+
+    Returns:
+        str: the hex digest of the sources
+    """
+    digest = hashlib.sha256()
+    directory = dirname(abspath(__file__))
+
+    for subdirectory in ["", "patterns"]:
+        path = join(directory, subdirectory)
+        for file in sorted(listdir(path)):
+            if file.endswith(".py"):
+                digest.update(file.encode("utf-8"))
+                with open(join(path, file), "rb") as source:
+                    digest.update(source.read())
+
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _list_objdumps(path):
+    """List all objdump tools in the directories.
+
+    Args:
+        path (tuple[str]): the directories to search
+
+    Returns:
+        list[str]: the paths of the objdump tools
+    """
+    objdumps = []
+    for dir in path:
+        try:
+            for file in listdir(dir):
+                if file.endswith("objdump"):
+                    objdumps.append(dir + file)
+        except FileNotFoundError:
+            pass
+
+    return objdumps
+
+
+def _get_stack_sub_size(operand):
+    """Convert the operand of a stack substraction into the size of the stack change.
+
+    Args:
+        operand (str): the hexadecimal or decimal operand
+
+    Returns:
+        int: the size of the stack change or None if the operand is out of range
+    """
+    size = int(operand, 16) if operand.startswith("0x") else int(operand)
+
+    if size > 0xF000000000000000:
+        return None
+
+    # Take the magnitude of negative 32bit values
+    if size > 0xF0000000:
+        size = 0x100000000 - size
+
+    if size > 0x10000000:
+        return None
+
+    return size
+
+
+def _plain(msg):
+    """Return the message without any text attributes."""
+    return msg
+
+
+@lru_cache(maxsize=4096)
+def _dark_text(msg):
+    """Return the message in dark.
+
+    The results are cached, since file and section names repeat across many rows.
+    """
+    return Color.DARK + msg + Color.END
+
+
+def _percent(part, total):
+    """Calculate the rounded percentage with integer arithmetic.
+
+    Args:
+        part (int):  the part of the total
+        total (int): the total
+
+    Returns:
+        int: the percentage of part related to total, 0 if total is 0
+    """
+    return (100 * part + total // 2) // total if total else 0
+
+
+class Statistic(NamedTuple):
     """Helper class to iterate easily through.
 
     Attributes:
@@ -57,24 +289,10 @@ class Statistic:
         data (data, optional): the additional data
     """
 
-    title = None
-    count = 0
-    percent = 0
-    data = None
-
-    def __init__(self, title, count, percent, data=None):
-        """Create the object.
-
-        Args:
-            title (str):   the description of the count
-            count (int):   the number of occurrences
-            percent (int): the percentage of count related to number of instructions
-            data (data):   the additional data
-        """
-        self.title = title
-        self.count = count
-        self.percent = percent
-        self.data = data
+    title: str
+    count: int
+    percent: int
+    data: object = None
 
 
 class Stacklimit:
@@ -82,6 +300,7 @@ class Stacklimit:
 
     Attributes:
         arch (str):                 the architecture the code was compiled for
+        pattern (type[Pattern]):    the instruction set of the architecture
         color (bool):               show messages in color
         debug (bool):               show debug messages
         quiet (bool):               Suppress informative messages
@@ -94,9 +313,13 @@ class Stacklimit:
         readelf_path (str):         the path to the readelf binary
         objdump_path (str):         the path to the objdump binary
         stacktable (Stack.Table):   the function database to calculate the stack size
+        _operations (Counter):      the number of executions of each instruction per
+                                    stack impact, which are not yet added to the
+                                    statistic of the stack table
     """
 
     arch = None
+    pattern = None
     color = None
     debug = None
     quiet = None
@@ -114,6 +337,7 @@ class Stacklimit:
     objdump_path = None
 
     stacktable = None
+    _operations = None
 
     def __init__(
         self,
@@ -170,6 +394,8 @@ class Stacklimit:
         self.warn_dynamic = warn
         self.multiple_warn = multiple_warn
         self.regard_os_functions = regard_os_functions
+        self._init_color()
+        self._operations = Counter()
         self.stacktable = Stack.Table(
             [Stack.Function(address=0, name="Function Pointer")]
         )
@@ -210,6 +436,40 @@ class Stacklimit:
         self._print(Message.DEBUG, "Using architecture " + self._bold(arch))
         self.arch = arch
 
+        if arch in aarch64.arch:
+            self.pattern = aarch64
+        elif arch in arm.arch:
+            self.pattern = arm
+        elif arch in x86.arch:
+            self.pattern = x86
+        elif arch in x86_64.arch:
+            self.pattern = x86_64
+        else:
+            self.pattern = None
+
+    def _init_color(self):
+        # Decide once which text attributes are applied instead of on every call
+        if not self.color:
+            self._attribute_note = _plain
+            self._attribute_ok = _plain
+            self._attribute_warn = _plain
+            self._bold = _plain
+            self._dark = _plain
+            self._func = _plain
+        else:
+            # Use the cached module function without a reference to the instance
+            self._dark = _dark_text
+
+        self._stack_impact_texts = {
+            stack_impact: self._stack_impact(stack_impact)
+            for stack_impact in (
+                StackImpact.No,
+                StackImpact.Clear,
+                StackImpact.Potential,
+                StackImpact.Weak,
+            )
+        }
+
     def _init_objdump(self, binary, objdump=None):
         self._print(
             Message.DEBUG,
@@ -247,61 +507,29 @@ class Stacklimit:
         self._print(Message.DEBUG, "Using '" + self._bold(self.objdump_path) + "'")
 
     def _attribute_note(self, msg):
-        if self.color:
-            return Color.YELLOW + msg + Color.END
-        else:
-            return msg
+        return Color.YELLOW + msg + Color.END
 
     def _attribute_ok(self, msg):
-        if self.color:
-            return Color.GREEN + msg + Color.END
-        else:
-            return msg
+        return Color.GREEN + msg + Color.END
 
     def _attribute_warn(self, msg):
-        if self.color:
-            return Color.RED + msg + Color.END
-        else:
-            return msg
+        return Color.RED + msg + Color.END
 
     def _bold(self, msg):
-        if self.color:
-            return Color.BOLD + msg + Color.END
-        else:
-            return msg
+        return Color.BOLD + msg + Color.END
 
     def _dark(self, msg):
-        if self.color:
-            return Color.DARK + msg + Color.END
-        else:
-            return msg
+        return _dark_text(msg)
 
     def _func(self, msg):
-        if self.color:
-            return Color.CYAN + msg + Color.END
-        else:
-            return msg
+        return Color.CYAN + msg + Color.END
 
     def _find_objdump(self, binary):
-        objdumps = []
-        for dir in PATH:
-            try:
-                for file in listdir(dir):
-                    if file.endswith("objdump"):
-                        objdumps.append(dir + file)
-            except FileNotFoundError:
-                pass
-
         self._print(Message.DEBUG, "Search compatible objdump...")
 
-        for objdump in objdumps:
-            cmd = [objdump, "--version"]
-            output = (
-                subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                .communicate()[0]
-                .decode("utf-8")
-            )
-
+        # Query the versions one after another to stop at the first compatible one
+        for objdump in _list_objdumps(tuple(PATH)):
+            output = _run(objdump, "--version")[1]
             if output == "":
                 self._print(
                     Message.DEBUG,
@@ -339,12 +567,7 @@ class Stacklimit:
         if not self._find_objdump(binary):
             return None
 
-        cmd = [self.objdump_path, "-a", binary]
-        output = (
-            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            .communicate()[0]
-            .decode("utf-8")
-        )
+        output = _run(self.objdump_path, "-a", binary)[1]
 
         if output == "":
             self._print(Message.DEBUG, "Couldn't read binary with objdump.")
@@ -371,12 +594,7 @@ class Stacklimit:
         if not binary:
             return None
 
-        cmd = [self.readelf_path, "-h", binary]
-        output = (
-            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            .communicate()[0]
-            .decode("utf-8")
-        )
+        output = _run(self.readelf_path, "-h", binary)[1]
 
         if output == "":
             self._print(Message.DEBUG, "Couldn't read binary with readelf.")
@@ -398,6 +616,113 @@ class Stacklimit:
 
         return get_arch(output)
 
+    def _get_cache_path(self, cache_dir, binary):
+        digest = hashlib.sha256(
+            "{} {} {} {} {}\n".format(
+                CACHE_VERSION,
+                _get_source_digest(),
+                self.arch,
+                self.objdump_path,
+                getmtime(self.objdump_path),
+            ).encode("utf-8")
+        )
+
+        with open(binary, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        return join(cache_dir, digest.hexdigest() + ".pickle")
+
+    def _load_cache(self, path):
+        try:
+            with open(path, "rb") as file:
+                (functions, operations, per_stack_impact) = pickle.load(file)
+
+            stacktable = Stack.Table([])
+
+            for address, name, section, file, size, dynamic, _, _ in functions:
+                function = stacktable.append(
+                    Stack.Function(
+                        address, name=name, section=section, file=file, size=size
+                    )
+                )
+                function.dynamic = dynamic
+
+            # The calls and returns are stored as indices of the stack table
+            for function, (*_, calls, returns) in zip(stacktable, functions):
+                function.calls.table = [stacktable[index] for index in calls]
+                function.returns.table = [stacktable[index] for index in returns]
+
+            statistic = stacktable.statistic
+            for operation, executions, stack_impact in operations:
+                statistic.per_operations[operation] = OperationStatistic(
+                    executions, stack_impact
+                )
+            statistic.per_stack_impact.update(per_stack_impact)
+            statistic.total_impacts = sum(per_stack_impact.values())
+        except FileNotFoundError:
+            return False
+        # A cache of another shape raises any of the other errors while unpacking it
+        except (
+            AttributeError,
+            EOFError,
+            ImportError,
+            IndexError,
+            KeyError,
+            OSError,
+            TypeError,
+            ValueError,
+            pickle.UnpicklingError,
+        ):
+            self._print(Message.DEBUG, "Couldn't read '" + self._bold(path) + "'")
+            return False
+
+        self.stacktable = stacktable
+        self._print(Message.DEBUG, "Using '" + self._bold(path) + "'")
+
+        return True
+
+    def _save_cache(self, path):
+        # Store the functions flat, since pickle recurses through references
+        index = {id(function): i for i, function in enumerate(self.stacktable)}
+        functions = [
+            (
+                function.address,
+                function.name,
+                function.section,
+                function.file,
+                function.size,
+                function.dynamic,
+                [index[id(call)] for call in function.calls],
+                [index[id(caller)] for caller in function.returns],
+            )
+            for function in self.stacktable
+        ]
+
+        statistic = self.stacktable.statistic
+        operations = [
+            (
+                operation,
+                operation_statistic.executions,
+                operation_statistic.stack_impact,
+            )
+            for operation, operation_statistic in statistic.per_operations.items()
+        ]
+
+        # Write to a temporary file first to not leave a partial cache behind
+        temp = "{}.{}".format(path, getpid())
+        try:
+            makedirs(dirname(path), exist_ok=True)
+            with open(temp, "wb") as file:
+                pickle.dump(
+                    (functions, operations, dict(statistic.per_stack_impact)),
+                    file,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+            replace(temp, path)
+        except OSError:
+            self._print(Message.DEBUG, "Couldn't write '" + self._bold(path) + "'")
+
     def _get_tool_path(self, tool):
         for dir in [""] + PATH:
             path = dir + tool
@@ -414,12 +739,7 @@ class Stacklimit:
         if not objdump:
             objdump = self.objdump_path
 
-        cmd = [objdump, "-d", "--stop-address=0", binary]
-        returncode = subprocess.call(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-
-        return returncode == 0
+        return _run(objdump, "-d", "--stop-address=0", binary)[0] == 0
 
     def _print(self, kind, *objects, sep=" ", end="\n", prefix=True):
         if kind is Message.DEBUG:
@@ -440,17 +760,38 @@ class Stacklimit:
                 print(text, end="")
             print(*objects, sep=sep, end=end)
 
-    def _print_call_branch(self, function, path=[]):
-        indent = 3 * (len(path) - 1)
-        alight = function in path
+    def _print_call_branch(self, function):
+        format_call_node = self._format_call_node
+        rows = []
+
+        # The path holds the ids of all functions above the current one. A function
+        # occurs only once in the stack table, so its id identifies it.
+        path = set()
+        callstack = []
+        # The iterators over the not yet printed calls of each function in callstack
+        branches = [iter((function,))]
+
+        while branches:
+            function = next(branches[-1], None)
 
-        self._print_call_node(function, indent, alight)
+            if function is None:
+                branches.pop()
+                if callstack:
+                    path.remove(callstack.pop())
+                continue
+
+            alight = id(function) in path
+
+            rows.append(format_call_node(function, 3 * (len(path) - 1), alight))
+
+            if not alight:
+                path.add(id(function))
+                callstack.append(id(function))
+                branches.append(iter(function.calls))
 
-        if not alight:
-            for calls in function.calls:
-                self._print_call_branch(calls, path + [function])
+        self._print(Message.INFO, "\n".join(rows))
 
-    def _print_call_node(self, function, indent=0, alight=False):
+    def _format_call_node(self, function, indent=0, alight=False):
         arrow = "-> " if function.returns else ""
         prefix = ""
         suffix = ""
@@ -490,11 +831,10 @@ class Stacklimit:
 
         prefix += arrow
 
-        self._print(Message.INFO, "{}{}{}".format(prefix, info, suffix))
+        return "{}{}{}".format(prefix, info, suffix)
 
-    def _print_cycle_warn(self, callstack):
+    def _print_cycle_warn(self, callstack, start):
         current = callstack[-1]
-        start = callstack.index(current)
 
         if self.multiple_warn:
             self._print(
@@ -544,9 +884,13 @@ class Stacklimit:
         operation = Pattern.get_operation(line)
 
         if operation is not None:
-            self.stacktable.statistic.add_operation(operation, stack_impact)
+            self._operations[operation, stack_impact] += 1
 
-        stack_impact_text = self._stack_impact(stack_impact)
+        # The rest only formats the debug message
+        if not self.debug:
+            return
+
+        stack_impact_text = self._stack_impact_texts[stack_impact]
 
         size_text = "     "
         if size:
@@ -596,11 +940,12 @@ class Stacklimit:
             else:
                 self._print(Message.WARN, "Found function pointers")
 
-    def _handle_cycle(self, callstack):
+    def _handle_cycle(self, visitor):
+        callstack = visitor.callstack
         current = callstack[-1]
 
-        start = callstack.index(current)
-        if not callstack or start == len(callstack) - 1:
+        start = visitor.depth(current)
+        if start == len(callstack) - 1:
             return False
 
         for node in callstack[:start]:
@@ -611,11 +956,13 @@ class Stacklimit:
 
         if self.warn_cycle:
             self.warn_cycle = self.multiple_warn
-            self._print_cycle_warn(callstack)
+            self._print_cycle_warn(callstack, start)
 
         return True
 
-    def _handle_node(self, callstack):
+    def _handle_node(self, visitor):
+        callstack = visitor.callstack
+
         if not callstack:
             return True
 
@@ -628,7 +975,7 @@ class Stacklimit:
             self._handle_dynamic(callstack)
             self._handle_function_pointer(callstack)
 
-        return self._handle_cycle(callstack)
+        return self._handle_cycle(visitor)
 
     def calculate_stack(self):
         """Calculate the maximal recursive stack size for each function.
@@ -644,13 +991,12 @@ class Stacklimit:
             current = visitor.down()
 
             if current:
-                skip = self._handle_node(visitor.callstack)
+                skip = self._handle_node(visitor)
                 current.visited = True
                 if not skip:
-                    subcall_size = 0
-                    for child in current.calls:
-                        subcall_size = max(subcall_size, child.total)
-                    current.total = current.size + subcall_size
+                    current.total = current.size + max(
+                        [child.total for child in current.calls], default=0
+                    )
 
             visitor.up()
 
@@ -660,7 +1006,7 @@ class Stacklimit:
 
         return True
 
-    def parse(self, binary):
+    def parse(self, binary, cache_dir=None):
         """Calculate the stack size of each function.
 
         Only the stack size of the function itself is considered. Stack changes caused by
@@ -668,114 +1014,148 @@ class Stacklimit:
 
         Args:
             binary (str): the path to the binary file
+            cache_dir (str, optional):
+                The directory to store the parsed functions in. If the binary, the
+                architecture and objdump haven't changed since the last parse, the
+                functions are loaded from there and the stack table is replaced. Debug
+                messages of the disassembly are not shown in that case. Defaults to
+                None.
         """
-        if self.arch in aarch64.arch:
-            pattern = aarch64
-        elif self.arch in arm.arch:
-            pattern = arm
-        elif self.arch in x86.arch:
-            pattern = x86
-        elif self.arch in x86_64.arch:
-            pattern = x86_64
-        else:
+        pattern = self.pattern
+        if not pattern:
             return
 
+        cache = None
+        if cache_dir:
+            cache = self._get_cache_path(cache_dir, binary)
+            if self._load_cache(cache):
+                return
+
+        (
+            match_file_format,
+            match_section,
+            match_function,
+            match_instruction,
+            search_mnemonic,
+        ) = _compile_pattern(pattern)
+
+        track_operation = self._track_operation
+        append = self.stacktable.append
+        # The stack impacts are needed for each instruction
+        no = StackImpact.No
+        clear = StackImpact.Clear
+        potential = StackImpact.Potential
+        weak = StackImpact.Weak
+
+        # Index the stack table by address instead of scanning it for each lookup.
+        # Like Stack.Table.find, the first function with an address wins.
+        functions = {}
+        for function in self.stacktable:
+            functions.setdefault(function.address, function)
+
         objdump_cmd = [self.objdump_path, "-d", binary]
         objdump = subprocess.Popen(
-            objdump_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            objdump_cmd,
+            bufsize=CHUNK_SIZE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
 
         file = None
         section = None
         current = None
+        callees = set()
+        # Count the operations in the loop and add them to the statistic afterwards
+        self._operations = Counter()
 
-        for line in objdump.stdout:
-            line = line.decode("utf-8")[:-1]
-
-            # Set file
-            if re.match(pattern.FileFormat, line):
-                line_array = line.split(" ")
-                path = line_array[0][:-1]
-                file = path.split("/")[-1]
-
-                # Skip the following code since this line is not an instruction
+        for line in _read_lines(objdump.stdout):
+            # Skip empty lines
+            if not line:
                 continue
 
-            # Set section
-            elif re.match(pattern.Section, line):
-                section = pattern.get_section(line)
-                self._print(Message.DEBUG)
-                self._print(Message.DEBUG, "Disassembly of section {}:".format(section))
+            # Instructions are indented, so only check the other lines for headers.
+            # The string tests are required parts of the header patterns and are
+            # cheaper than the regexes.
+            if line[0] not in " \t":
+                # Set file
+                if "file format " in line and match_file_format(line):
+                    line_array = line.split(" ")
+                    path = line_array[0][:-1]
+                    file = path.split("/")[-1]
+
+                    # Skip the following code since this line is not an instruction
+                    continue
 
-                # Skip the following code since this line is not an instruction
-                continue
+                # Set section
+                elif line.startswith("Disassembly of section ") and match_section(line):
+                    section = pattern.get_section(line)
+                    self._print(Message.DEBUG)
+                    self._print(
+                        Message.DEBUG, "Disassembly of section {}:".format(section)
+                    )
 
-            elif re.match(pattern.Function, line):
-                (address, name) = pattern.get_function(line)
-                current = self.stacktable.find(address)
+                    # Skip the following code since this line is not an instruction
+                    continue
 
-                if current:
-                    current.file = file
-                    current.section = section
-                else:
-                    current = self.stacktable.append(
-                        Stack.Function(
-                            address=address, name=name, section=section, file=file
+                elif line.endswith(">:") and match_function(line):
+                    (address, name) = pattern.get_function(line)
+                    current = functions.get(address)
+
+                    if current:
+                        current.file = file
+                        current.section = section
+                    else:
+                        current = functions[address] = append(
+                            Stack.Function(
+                                address=address,
+                                name=name,
+                                section=section,
+                                file=file,
+                            )
                         )
-                    )
 
-                current.visited = True
-                self._print(Message.DEBUG, "{}:".format(self._func(name)))
+                    callees = {function.address for function in current.calls}
 
-            # Empty line
-            elif len(line) == 0:
-                continue
+                    current.visited = True
+                    if self.debug:
+                        self._print(Message.DEBUG, "{}:".format(self._func(name)))
 
             # Analyze the instruction
+            match = None
+            if match_instruction and (not search_mnemonic or search_mnemonic(line)):
+                match = match_instruction(line)
+            kind = match.lastgroup if match else None
 
-            if pattern.StackPushOp and re.match(pattern.StackPushOp, line):
+            if kind == "StackPushOp":
                 size = pattern.get_stack_push_size(line)
                 current.size += size
-                self._track_operation("StackPushOp", line, StackImpact.Clear, size)
+                track_operation("StackPushOp", line, clear, size)
 
             # TODO: Only track sub with positive numbers and add with negative numbers
             # Note: We ignore all 'add' operations. We're only interested in 'sub'.
-            elif pattern.StackSubOp and re.match(pattern.StackSubOp, line):
-                temp = pattern.get_stack_sub_size(line)
-                if temp[:2] == "0x":
-                    size = int(temp, 16)
-                else:
-                    size = int(temp)
-
-                # TODO: Rewrite this
-                if size > 0xF000000000000000:
-                    continue
-
-                if size > 0xF0000000:
-                    size = -size
-                    size += 0x80000000
-                    size += 0x80000000
-
-                if size > 0x10000000:
+            elif kind == "StackSubOp":
+                size = _get_stack_sub_size(pattern.get_stack_sub_size(line))
+                if size is None:
                     continue
 
                 current.size += size
-                self._track_operation("StackSubOp", line, StackImpact.Clear, size)
+                track_operation("StackSubOp", line, clear, size)
 
-            elif pattern.StackDynamicOp and re.match(pattern.StackDynamicOp, line):
+            elif kind == "StackDynamicOp":
                 current.dynamic = True
-                self._track_operation("StackDynamicOp", line, StackImpact.Weak)
+                track_operation("StackDynamicOp", line, weak)
 
-            elif pattern.FunctionCall and re.match(pattern.FunctionCall, line):
+            elif kind == "FunctionCall":
                 (address, name) = pattern.get_function_call(line)
-                function = self.stacktable.find(address)
+                function = functions.get(address)
 
                 if not function:
-                    function = self.stacktable.append(
+                    function = functions[address] = append(
                         Stack.Function(address=address, name=name)
                     )
 
-                if not current.calls.find(address):
+                if address not in callees:
+                    callees.add(address)
                     current.calls.append(function)
                     function.returns.append(current)
 
@@ -783,40 +1163,59 @@ class Stacklimit:
                 current.size += size
                 if size == 0:
                     size = None
-                self._track_operation("FunctionCall", line, StackImpact.Clear, size)
+                track_operation("FunctionCall", line, clear, size)
 
-            elif pattern.FunctionPointer and re.match(pattern.FunctionPointer, line):
-                function_pointer = self.stacktable.find(0)
+            elif kind == "FunctionPointer":
+                function_pointer = functions.get(0)
+                callees.add(0)
                 current.calls.append(function_pointer)
                 function_pointer.returns.append(current)
 
-                self._track_operation("FunctionPointer", line, StackImpact.Weak)
+                track_operation("FunctionPointer", line, weak)
 
-            elif pattern.PotentialStackOp and re.match(pattern.PotentialStackOp, line):
-                self._track_operation("PotentialStackOp", line, StackImpact.Potential)
+            elif kind == "PotentialStackOp":
+                track_operation("PotentialStackOp", line, potential)
             else:
-                self._track_operation("", line, StackImpact.No)
+                track_operation("", line, no)
+
+        self.stacktable.statistic.add_operations(self._operations)
 
-        for function in [
+        unvisited = [
             function
             for function in self.stacktable
             if not function.visited and function.address != 0
-        ]:
-            address = self._bold(hex(function.address))
-            name = self._func(function.returns[0].name)
-            self._print(
-                Message.DEBUG,
-                "Ignore inner FunctionCall in {} to {} ({})".format(
-                    name, address, function.name
-                ),
-            )
-            del self.stacktable[function]
+        ]
+        # Each caller loses all its unvisited calls at once
+        callers = {}
+
+        for function in unvisited:
+            if self.debug:
+                address = self._bold(hex(function.address))
+                name = self._func(function.returns[0].name)
+                self._print(
+                    Message.DEBUG,
+                    "Ignore inner FunctionCall in {} to {} ({})".format(
+                        name, address, function.name
+                    ),
+                )
             for caller in function.returns:
-                del caller.calls[function]
+                callers[id(caller)] = caller
+
+        self.stacktable.remove(unvisited)
+
+        # Filter the calls with one set of ids instead of building it for each caller
+        removed = {id(function) for function in unvisited}
+        for caller in callers.values():
+            caller.calls.table[:] = [
+                call for call in caller.calls if id(call) not in removed
+            ]
 
         for function in self.stacktable:
             function.visited = False
 
+        if cache:
+            self._save_cache(cache)
+
         if self.debug:
             print()
 
@@ -849,20 +1248,23 @@ class Stacklimit:
         # This is correct! The length is increment by one later
         total_len = 9999 if show_header else 1
 
-        for function in self.stacktable:
-            address_len = max(function.address, address_len)
-            name_len = max(len(function.name), name_len)
-            if function.file:
-                file_len = max(len(function.file), file_len)
-            if show_section and function.section:
-                section_len = max(len(function.section), section_len)
-            size_len = max(function.size, size_len)
-            total_len = max(function.total, total_len)
-
-        address_len = int(log(address_len, 16).real + 3)
-        size_len = int(log(size_len, 10).real + 1)
+        # Sweep each column separately, so the maxima are taken by builtins in C
+        functions = self.stacktable.table
+        address_len = max(max(map(attrgetter("address"), functions)), address_len)
+        name_len = max(max(map(len, map(attrgetter("name"), functions))), name_len)
+        files = filter(None, map(attrgetter("file"), functions))
+        file_len = max(max(map(len, files), default=0), file_len)
+        if show_section:
+            sections = filter(None, map(attrgetter("section"), functions))
+            section_len = max(max(map(len, sections), default=0), section_len)
+        size_len = max(max(map(attrgetter("size"), functions)), size_len)
+        total_len = max(max(map(attrgetter("total"), functions)), total_len)
+
+        # Count the hex digits and add the length of the "0x" prefix
+        address_len = (address_len.bit_length() + 3) // 4 + 2
+        size_len = len(str(size_len))
         # Increment the length for the imprecise symbol
-        total_len = int(log(total_len, 10).real + 1) + 1
+        total_len = len(str(total_len)) + 1
 
         self._print(Message.INFO)
 
@@ -892,35 +1294,31 @@ class Stacklimit:
 
         self.stacktable.sort()
 
+        bold = self._bold
+        dark = self._dark
+        rows = []
+
         for function in self.stacktable:
             if self._regard_function(function):
-                address = self._bold(
-                    "{:#0{width}x}".format(function.address, width=address_len)
-                )
-                name = self._func("{:{width}}".format(function.name, width=name_len))
+                address = bold(f"{function.address:#0{address_len}x}")
+                name = self._func(function.name.ljust(name_len))
                 section = ""
-                file = function.file if function.file else ""
-                file = self._dark("{:{width}}".format(file, width=file_len))
-                size = "{:{width}}".format(function.size, width=size_len)
+                file = function.file or ""
+                file = dark(file.ljust(file_len))
+                size = str(function.size).rjust(size_len)
                 # Workaround for text with color
-                total = self._bold(str(function.total))
+                total = bold(str(function.total))
                 imprecise = ">" if function.imprecise else " "
-                total_prefix_len = total_len - int(log(function.total + 1, 10).real) - 1
-                total = "{:>{width}}{}".format(imprecise, total, width=total_prefix_len)
+                total = imprecise.rjust(total_len - len(str(function.total))) + total
 
                 if show_section:
-                    section = function.section if function.section else ""
-                    section = self._dark(
-                        "{:{width}}".format(section, width=section_len)
-                    )
-                    section = section + " "
+                    section = function.section or ""
+                    section = dark(section.ljust(section_len)) + " "
 
-                self._print(
-                    Message.INFO,
-                    "{} {}  {}{}  {} {}".format(
-                        address, name, section, file, size, total
-                    ),
-                )
+                rows.append(f"{address} {name}  {section}{file}  {size} {total}")
+
+        if rows:
+            self._print(Message.INFO, "\n".join(rows))
 
     def print_statistic_of_operations(self, show_header=False):
         """Print statistic of the parsed instructions.
@@ -931,54 +1329,45 @@ class Stacklimit:
         """
         operations = self.stacktable.statistic.per_operations
 
-        total = 0
-        title_len = 9 if show_header else 1
-        count_len = 99999 if show_header else 1
+        if not operations:
+            return
+
+        counts = [operation.executions for operation in operations.values()]
 
-        for operation in operations:
-            total += operations[operation].executions
-            title_len = max(len(operation), title_len)
-            count_len = max(operations[operation].executions, count_len)
+        total = sum(counts)
+        title_len = max(max(map(len, operations)), 9 if show_header else 1)
+        count_len = max(max(counts), 99999 if show_header else 1)
 
-        count_len = int(log(count_len, 10).real + 1) + 1
+        count_len = len(str(count_len)) + 1
         percent_len = 4
 
         statistics = [Statistic("total", total, 100, StackImpact.No)]
-        for operation in operations:
-            executions = operations[operation].executions
-            executions_percent = round(100 * float(executions / total))
-            stack_impact = operations[operation].stack_impact
+        for operation, operation_statistic in operations.items():
+            executions = operation_statistic.executions
+            executions_percent = _percent(executions, total)
+            stack_impact = operation_statistic.stack_impact
             statistics.append(
                 Statistic(operation, executions, executions_percent, stack_impact)
             )
 
-        statistics.sort(key=lambda statistic: statistic.count, reverse=True)
+        statistics.sort(key=attrgetter("count"), reverse=True)
 
         if show_header:
             self._print(
                 Message.INFO,
-                "{:<{}} {:>{}}  {:>{}}  stack impact".format(
-                    "operation",
-                    title_len,
-                    "count",
-                    count_len,
-                    "%",
-                    percent_len,
-                ),
-            )
-
-        for statistic in statistics:
-            operation = "{:{width}}".format(statistic.title, width=title_len)
-            count = "{:{width}}".format(statistic.count, width=count_len)
-            percent = self._bold(
-                "{:{width}}".format(statistic.percent, width=percent_len)
+                f"{'operation':<{title_len}} {'count':>{count_len}}  "
+                f"{'%':>{percent_len}}  stack impact",
             )
-            stack_impact = self._stack_impact(statistic.data)
 
-            self._print(
-                Message.INFO,
-                "{} {} {}%  {}".format(operation, count, percent, stack_impact),
-            )
+        bold = self._bold
+        stack_impact_texts = self._stack_impact_texts
+        rows = [
+            f"{statistic.title:{title_len}} {statistic.count:{count_len}} "
+            f"{bold(str(statistic.percent).rjust(percent_len))}%  "
+            f"{stack_impact_texts[statistic.data]}"
+            for statistic in statistics
+        ]
+        self._print(Message.INFO, "\n".join(rows))
 
     def print_statistic_of_stack_impacts(self, show_header=False):
         """Print stack impact statistic of the parsed instructions.
@@ -987,73 +1376,61 @@ class Stacklimit:
             show_header (bool, optional):
                 Show the column headers of the table. Defaults to False.
         """
-        total = sum(self.stacktable.statistic.per_stack_impact.values())
+        statistic = self.stacktable.statistic
+        total = statistic.total_impacts
 
-        clear = self.stacktable.statistic.per_stack_impact[StackImpact.Clear]
-        clear_percent = round(100 * float(clear / total))
+        if total == 0:
+            return
 
-        weak = self.stacktable.statistic.per_stack_impact[StackImpact.Weak]
-        weak_percent = round(100 * float(weak / total))
+        per_stack_impact = statistic.per_stack_impact
 
-        skipped_clear = self.stacktable.statistic.per_stack_impact[StackImpact.No]
-        skipped_clear_percent = round(100 * float(skipped_clear / total))
+        clear = per_stack_impact[StackImpact.Clear]
+        clear_percent = _percent(clear, total)
 
-        skipped_potential = self.stacktable.statistic.per_stack_impact[
-            StackImpact.Potential
-        ]
-        skipped_potential_percent = round(100 * float(skipped_potential / total))
+        weak = per_stack_impact[StackImpact.Weak]
+        weak_percent = _percent(weak, total)
+
+        skipped_clear = per_stack_impact[StackImpact.No]
+        skipped_clear_percent = _percent(skipped_clear, total)
+
+        skipped_potential = per_stack_impact[StackImpact.Potential]
+        skipped_potential_percent = _percent(skipped_potential, total)
 
         skipped = skipped_clear + skipped_potential
         skipped_percent = skipped_clear_percent + skipped_potential_percent
 
-        title_len = 8
-        count_len = 99999 if show_header else 1
-
-        statistics = [
-            Statistic("total", total, 100),
-            Statistic("clear", clear, clear_percent),
-            Statistic("weak (unknown stack impact)", weak, weak_percent),
-            Statistic("skipped", skipped, skipped_percent),
-            Statistic(
+        statistics = (
+            ("total", total, 100),
+            ("clear", clear, clear_percent),
+            ("weak (unknown stack impact)", weak, weak_percent),
+            ("skipped", skipped, skipped_percent),
+            (
                 "  potential stack instructions",
                 skipped_potential,
                 skipped_potential_percent,
             ),
-            Statistic(
-                "  unexpected stack impact",
-                skipped_clear,
-                skipped_clear_percent,
-            ),
-        ]
-
-        for statistic in statistics:
-            title_len = max(len(statistic.title), title_len)
-            count_len = max(statistic.count, count_len)
+            ("  unexpected stack impact", skipped_clear, skipped_clear_percent),
+        )
 
-        count_len = int(log(count_len, 10).real + 1)
+        title_len = max(max(len(title) for title, _, _ in statistics), 8)
+        # The total is the largest count
+        count_len = max(total, 99999 if show_header else 1)
+        count_len = len(str(count_len))
         percent_len = 4
 
         if show_header:
             self._print(
                 Message.INFO,
-                "{:<{}} {:>{}}  {:>{}}".format(
-                    "",
-                    title_len,
-                    "count",
-                    count_len,
-                    "%",
-                    percent_len,
-                ),
+                f"{'':<{title_len}} {'count':>{count_len}}  {'%':>{percent_len}}",
             )
 
-        for statistic in statistics:
-            title = "{:{width}}".format(statistic.title, width=title_len)
-            count = "{:{width}}".format(statistic.count, width=count_len)
-            percent = self._bold(
-                "{:{width}}".format(statistic.percent, width=percent_len)
-            )
-
-            self._print(Message.INFO, "{} {} {}%".format(title, count, percent))
+        bold = self._bold
+        rows = [
+            f"{title:{title_len}} {count:{count_len}} "
+            f"{bold(str(percent).rjust(percent_len))}%"
+            for title, count, percent in statistics
+        ]
+        self._print(Message.INFO, "\n".join(rows))
 
     def print_statistic(self, show_header=False, show_operation_statistic=False):
         """Print statistic of the parsed instructions.
@@ -1071,6 +1448,13 @@ class Stacklimit:
 
     def print_call_tree(self):
         """Print the function call tree."""
+        # The tree consists of informative messages only
+        if self.quiet:
+            return
+
+        regard_function = self._regard_function
+        print_call_branch = self._print_call_branch
+
         for top in self.stacktable:
-            if not top.returns and self._regard_function(top):
-                self._print_call_branch(top)
+            if not top.returns and regard_function(top):
+                print_call_branch(top)
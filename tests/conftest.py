@@ -0,0 +1,11 @@
+# SPDX-FileCopyrightText: 2022 CETITEC GmbH <https://www.cetitec.com>
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""Configuration of the test cases."""
+
+import sys
+from os.path import dirname, join
+
+# The modules of the tool import each other like scripts (see stacklimit/main.py)
+sys.path.insert(0, join(dirname(dirname(__file__)), "stacklimit"))
@@ -10,6 +10,11 @@ import pytest
 
 from stacklimit.patterns import Pattern
 
+# Compile the patterns once for all test cases
+match_file_format = re.compile(Pattern.FileFormat).match
+match_section = re.compile(Pattern.Section).match
+match_function = re.compile(Pattern.Function).match
+
 file_formats = [
     "filename:      file format elf64-x86-64",
     "tests/dep-aarch64_O1:     file format elf64-little",
@@ -51,37 +56,37 @@ functions_negative = [
 @pytest.mark.parametrize("line", file_formats)
 def test_pattern_file_format(line):
     """Test Pattern.FileFormat."""
-    assert re.match(Pattern.FileFormat, line)
+    assert match_file_format(line)
 
 
 @pytest.mark.parametrize("line", file_formats_negative)
 def test_pattern_file_format_with_negative_line(line):
     """Test Pattern.FileFormat with lines without matches."""
-    assert re.match(Pattern.FileFormat, line) == None
+    assert match_file_format(line) == None
 
 
 @pytest.mark.parametrize("line, section", sections)
 def test_pattern_section(line, section):
     """Test Pattern.Section."""
-    assert re.match(Pattern.Section, line)
+    assert match_section(line)
 
 
 @pytest.mark.parametrize("line", sections_negative)
 def test_pattern_section_with_negative_line(line):
     """Test Pattern.Section with lines without matches."""
-    assert re.match(Pattern.Section, line) == None
+    assert match_section(line) == None
 
 
 @pytest.mark.parametrize("line, address, name", functions)
 def test_pattern_function(line, address, name):
     """Test Pattern.Function."""
-    assert re.match(Pattern.Function, line)
+    assert match_function(line)
 
 
 @pytest.mark.parametrize("line", functions_negative)
 def test_pattern_function_with_negative_line(line):
     """Test Pattern.Function with lines without matches."""
-    assert re.match(Pattern.Function, line) == None
+    assert match_function(line) == None
 
 
 @pytest.mark.parametrize(
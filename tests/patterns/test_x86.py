@@ -4,13 +4,19 @@
 
 """Test cases for methods and classes defined in patterns/x86.py file."""
 
-import itertools
 import re
 
 import pytest
 
 from stacklimit.patterns import x86
 
+# Compile the patterns once for all test cases
+match_function_call = re.compile(x86.FunctionCall).match
+match_function_pointer = re.compile(x86.FunctionPointer).match
+match_stack_dynamic_op = re.compile(x86.StackDynamicOp).match
+match_stack_push_op = re.compile(x86.StackPushOp).match
+match_stack_sub_op = re.compile(x86.StackSubOp).match
+
 constants = [
     "$0x0",
     "$0x3f",
@@ -23,42 +29,38 @@ stack_pointers = ["esp", "rsp", "lsp"]
 
 # General purpose 1 byte (integer) registers
 reg1byte = [
-    "".join(reg)
-    for reg in itertools.chain(
-        list(itertools.product("%", "abcd", "hl")),
-        list(itertools.product("%", ["bp", "si", "di", "sp"], "l")),
-        list(itertools.product("%", "r", [str(n) for n in range(8, 16)], "b")),
-    )
+    # fmt: off
+    "%ah", "%al", "%bh", "%bl", "%ch", "%cl", "%dh", "%dl",
+    "%bpl", "%sil", "%dil", "%spl",
+    "%r8b", "%r9b", "%r10b", "%r11b", "%r12b", "%r13b", "%r14b", "%r15b",
+    # fmt: on
 ]
 
 # General purpose 2 byte (integer) registers
 reg2bytes = [
-    "".join(reg)
-    for reg in itertools.chain(
-        list(itertools.product("%", "abcd", "x")),
-        list(itertools.product("%", ["bp", "si", "di", "sp"])),
-        list(itertools.product("%", "r", [str(n) for n in range(8, 16)], "w")),
-    )
+    # fmt: off
+    "%ax", "%bx", "%cx", "%dx",
+    "%bp", "%si", "%di", "%sp",
+    "%r8w", "%r9w", "%r10w", "%r11w", "%r12w", "%r13w", "%r14w", "%r15w",
+    # fmt: on
 ]
 
 # General purpose 4 byte (integer) registers
 reg4bytes = [
-    "".join(reg)
-    for reg in itertools.chain(
-        list(itertools.product("%", "e", "abcd", "x")),
-        list(itertools.product("%", "e", ["bp", "si", "di", "sp"])),
-        list(itertools.product("%", "r", [str(n) for n in range(8, 16)], "d")),
-    )
+    # fmt: off
+    "%eax", "%ebx", "%ecx", "%edx",
+    "%ebp", "%esi", "%edi", "%esp",
+    "%r8d", "%r9d", "%r10d", "%r11d", "%r12d", "%r13d", "%r14d", "%r15d",
+    # fmt: on
 ]
 
 # General purpose 8 byte (integer) registers
 reg8bytes = [
-    "".join(reg)
-    for reg in itertools.chain(
-        list(itertools.product("%", "r", "abcd", "x")),
-        list(itertools.product("%", "r", ["bp", "si", "di", "sp"])),
-        list(itertools.product("%", "r", [str(n) for n in range(8, 16)])),
-    )
+    # fmt: off
+    "%rax", "%rbx", "%rcx", "%rdx",
+    "%rbp", "%rsi", "%rdi", "%rsp",
+    "%r8", "%r9", "%r10", "%r11", "%r12", "%r13", "%r14", "%r15",
+    # fmt: on
 ]
 
 register_sizes = [
@@ -117,16 +119,10 @@ function_pointer_negative = [
 # * reg4bytes
 # * reg8bytes
 stack_push_op = [
-    n
+    ("4004c3:   55                      {}   {}".format(instruction, register), size)
     for registers, size in register_sizes
-    for n in itertools.product(
-        [
-            "4004c3:   55                      {}   {}".format(instruction, register)
-            for instruction in ["push", "pushl"]
-            for register in registers
-        ],
-        [size],
-    )
+    for instruction in ["push", "pushl"]
+    for register in registers
 ]
 
 stack_push_op_negative = [
@@ -149,61 +145,74 @@ stack_sub_op_negative = [
 @pytest.mark.parametrize("line, address, name", function_calls)
 def test_x86_function_call(line, address, name):
     """Test x86.FunctionCall."""
-    assert re.match(x86.FunctionCall, line)
+    assert match_function_call(line)
 
 
 @pytest.mark.parametrize("line", function_calls_negative)
 def test_x86_function_call_with_negative_line(line):
     """Test x86.FunctionCall with lines without matches."""
-    assert re.match(x86.FunctionCall, line) == None
+    assert match_function_call(line) == None
 
 
 @pytest.mark.parametrize("line", function_pointer)
 def test_x86_function_pointer(line):
     """Test x86.FunctionPointer."""
-    assert re.match(x86.FunctionPointer, line)
+    assert match_function_pointer(line)
 
 
 @pytest.mark.parametrize("line", function_pointer_negative)
 def test_x86_function_pointer_with_negative_line(line):
     """Test x86.FunctionPointer with lines without matches."""
-    assert re.match(x86.FunctionPointer, line) == None
+    assert match_function_pointer(line) == None
 
 
 @pytest.mark.parametrize("line", stack_dynamic_op)
 def test_x86_stack_dynamic_op(line):
     """Test x86.StackDynamicOp."""
-    assert re.match(x86.StackDynamicOp, line)
+    assert match_stack_dynamic_op(line)
 
 
 @pytest.mark.parametrize("line", stack_dynamic_op_negative)
 def test_x86_stack_dynamic_op_with_negative_line(line):
     """Test x86.StackDynamicOp with lines without matches."""
-    assert re.match(x86.StackDynamicOp, line) == None
+    assert match_stack_dynamic_op(line) == None
 
 
 @pytest.mark.parametrize("line, size", stack_push_op)
 def test_x86_stack_push_op(line, size):
     """Test x86.StackPushOp."""
-    assert re.match(x86.StackPushOp, line)
+    assert match_stack_push_op(line)
 
 
 @pytest.mark.parametrize("line", stack_push_op_negative)
 def test_x86_stack_push_op_with_negative_line(line):
     """Test x86.StackPushOp with lines without matches."""
-    assert re.match(x86.StackPushOp, line) == None
+    assert match_stack_push_op(line) == None
 
 
 @pytest.mark.parametrize("line, size", stack_sub_op)
 def test_x86_stack_sub_op(line, size):
     """Test x86.StackSubOp."""
-    assert re.match(x86.StackSubOp, line)
+    assert match_stack_sub_op(line)
 
 
 @pytest.mark.parametrize("line", stack_sub_op_negative)
 def test_x86_stack_sub_op_with_negative_line(line):
     """Test x86.StackSubOp with lines without matches."""
-    assert re.match(x86.StackSubOp, line) == None
+    assert match_stack_sub_op(line) == None
+
+
+@pytest.mark.parametrize(
+    "line",
+    [line for (line, address, name) in function_calls]
+    + function_pointer
+    + stack_dynamic_op
+    + [line for (line, size) in stack_push_op]
+    + [line for (line, size) in stack_sub_op],
+)
+def test_x86_mnemonics(line):
+    """Test x86.mnemonics with lines matching the instruction patterns."""
+    assert any(mnemonic in line for mnemonic in x86.mnemonics)
 
 
 @pytest.mark.parametrize("line, address, name", function_calls)
@@ -4,13 +4,15 @@
 
 """Test cases for methods and classes defined in patterns/x86_64.py file."""
 
-import itertools
 import re
 
 import pytest
 
 from stacklimit.patterns import x86_64
 
+# Compile the patterns once for all test cases
+match_stack_push_op = re.compile(x86_64.StackPushOp).match
+
 constants = [
     "$0x0",
     "$0x3f",
@@ -44,13 +46,13 @@ stack_push_op_negative = [
 @pytest.mark.parametrize("line", stack_push_op)
 def test_x86_64_stack_push_op(line):
     """Test x86_64.StackPushOp."""
-    assert re.match(x86_64.StackPushOp, line)
+    assert match_stack_push_op(line)
 
 
 @pytest.mark.parametrize("line", stack_push_op_negative)
 def test_x86_64_stack_push_op_with_negative_line(line):
     """Test x86_64.StackPushOp with lines without matches."""
-    assert re.match(x86_64.StackPushOp, line) == None
+    assert match_stack_push_op(line) == None
 
 
 @pytest.mark.parametrize("line", function_calls)
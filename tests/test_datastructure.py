@@ -6,40 +6,46 @@
 
 import itertools
 import operator
+from functools import lru_cache
+from typing import NamedTuple
 
 import pytest
 
-from stacklimit.datastructure import Stack, Visitor
+from stacklimit.datastructure import Stack, StackImpact, Visitor
+
+
+@lru_cache(maxsize=None)
+def get_function(address):
+    """Return a shared function of the address for the visitors of the test cases below.
+
+    Args:
+        address (int): the start address of the function
+    """
+    return Stack.Function(address)
 
 
 def create_visitor(callstack, queue):
     """Create a visitor easily for the test cases below.
 
     Args:
-        callstack (list[int]):   the callstack with addresses the visitor shall be
-                                 initialized with
-        queue (list[list[int]]): the queue with lists of addresses the visitor shall be
-                                 initialized with
+        callstack (tuple[int]):    the callstack with addresses the visitor shall be
+                                   initialized with
+        queue (tuple[tuple[int]]): the queue with tuples of addresses the visitor
+                                   shall be initialized with
     """
     visitor = Visitor()
 
-    visitor.callstack = [Stack.Function(address) for address in callstack]
+    visitor.callstack = [get_function(address) for address in callstack]
     for calls in queue:
-        visitor.queue.append([Stack.Function(address) for address in calls])
+        visitor.queue.append([get_function(address) for address in calls])
 
     return visitor
 
 
-def test_visitor__init__with_none():
-    """Test Visitor.__init__(None)."""
-    visitor = Visitor(None)
-    assert visitor.callstack == []
-    assert visitor.queue == [[]]
-
-
-def test_visitor__init__with_empty_list():
-    """Test Visitor.__init__([])."""
-    visitor = Visitor([])
+@pytest.mark.parametrize("entrances", [None, []])
+def test_visitor__init__without_entrances(entrances):
+    """Test Visitor.__init__(None) and Visitor.__init__([])."""
+    visitor = Visitor(entrances)
     assert visitor.callstack == []
     assert visitor.queue == [[]]
 
@@ -62,35 +68,72 @@ def test_visitor__init__():
     assert visitor.queue[0][1] in entrances
 
 
-@pytest.mark.parametrize(
-    "callstack1, queue1, callstack2, queue2, expected",
-    [
-        # fmt: off
-        ([],  [],         [],  [],         True),
-        ([0], [[1]],      [0], [[1]],      True),
-        ([0], [[1]],      [0], [[0]],      False),
-        ([0], [[1]],      [1], [[1]],      False),
-        ([0], [[1]],      [1], [[0]],      False),
-        ([],  [[1, 2]],   [],  [[1, 2]],   True),
-        ([],  [[1]],      [],  [[1, 2]],   False),
-        ([],  [[1, 2]],   [],  [[1, 3]],   False),
-        ([],  [[1], []],  [],  [[1], []],  True),
-        ([],  [[1]],      [],  [[1], []],  False),
-        ([],  [[1]],      [],  [[1], [1]], False),
-        ([],  [[1], [2]], [],  [[1], [2]], True),
-        ([],  [[1], [2]], [],  [[1], [3]], False),
-        ([0], [],         [0], [],         True),
-        ([0], [],         [0, 1], [],      False),
-        # fmt: on
-    ],
+class EqualCase(NamedTuple):
+    """A case of test_visitor_equal.
+
+    Attributes:
+        callstack1 (tuple[int]):    the callstack addresses of the first visitor
+        queue1 (tuple[tuple[int]]): the queue addresses of the first visitor
+        callstack2 (tuple[int]):    the callstack addresses of the second visitor
+        queue2 (tuple[tuple[int]]): the queue addresses of the second visitor
+        expected (bool):            if both visitors are equal
+    """
+
+    callstack1: tuple
+    queue1: tuple
+    callstack2: tuple
+    queue2: tuple
+    expected: bool
+
+
+EQUAL_CASES = (
+    # fmt: off
+    EqualCase((),  (),           (),  (),           True),
+    EqualCase((0,), ((1,),),     (0,), ((1,),),     True),
+    EqualCase((0,), ((1,),),     (0,), ((0,),),     False),
+    EqualCase((0,), ((1,),),     (1,), ((1,),),     False),
+    EqualCase((0,), ((1,),),     (1,), ((0,),),     False),
+    EqualCase((),  ((1, 2),),    (),  ((1, 2),),    True),
+    EqualCase((),  ((1,),),      (),  ((1, 2),),    False),
+    EqualCase((),  ((1, 2),),    (),  ((1, 3),),    False),
+    EqualCase((),  ((1,), ()),   (),  ((1,), ()),   True),
+    EqualCase((),  ((1,),),      (),  ((1,), ()),   False),
+    EqualCase((),  ((1,),),      (),  ((1,), (1,)), False),
+    EqualCase((),  ((1,), (2,)), (),  ((1,), (2,)), True),
+    EqualCase((),  ((1,), (2,)), (),  ((1,), (3,)), False),
+    EqualCase((0,), (),          (0,), (),          True),
+    EqualCase((0,), (),          (0, 1), (),        False),
+    # fmt: on
 )
-def test_visitor_equal(callstack1, queue1, callstack2, queue2, expected):
+
+
+def test_visitor_equal():
     """Test Visitor.__eq__() and  Visitor.__ne__()."""
-    visitor1 = create_visitor(callstack1, queue1)
-    visitor2 = create_visitor(callstack2, queue2)
+    # The comparisons are cheap, so check all cases in a single test
+    for case in EQUAL_CASES:
+        visitor1 = create_visitor(case.callstack1, case.queue1)
+        visitor2 = create_visitor(case.callstack2, case.queue2)
+
+        assert visitor1.__eq__(visitor2) == case.expected, case
+        assert visitor1.__ne__(visitor2) == (not case.expected), case
+
 
-    assert visitor1.__eq__(visitor2) == expected
-    assert visitor1.__ne__(visitor2) == (not expected)
+def init_visitor(callstack, queue):
+    """Create a visitor in the given state for the walking test cases below.
+
+    Args:
+        callstack (list[Stack.Function]):   the callstack of the visitor
+        queue (list[list[Stack.Function]]): the queue of the visitor
+    """
+    # Skip Visitor.__init__(), since both attributes are set anyway
+    visitor = Visitor.__new__(Visitor)
+    visitor.callstack = callstack
+    visitor.queue = queue
+    visitor.depths = {}
+    for depth, function in enumerate(callstack):
+        visitor.depths.setdefault(id(function), depth)
+
+    return visitor
 
 
 @pytest.fixture
@@ -194,9 +237,7 @@ def test_visitor_down_with_two_unvisited_children(functions1):
        / \      / \
       1   2    1 ->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions1[0]], [[]])
 
     assert visitor.down() == functions1[2]
 
@@ -212,9 +253,7 @@ def test_visitor_down_with_three_unvisited_children(functions2):
        / | \      / | \
       1  2  3    1  2->3
     """
-    visitor = Visitor()
-    visitor.callstack = [functions2[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions2[0]], [[]])
 
     assert visitor.down() == functions2[3]
 
@@ -230,9 +269,7 @@ def test_visitor_down_with_left_visited_child(functions1):
        / \      / \
       1*  2    1*->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions1[0]], [[]])
 
     functions1[1].visited = True
 
@@ -250,9 +287,7 @@ def test_visitor_down_with_right_visited_child(functions1):
        / \      / \
       1   2* ->1   2*
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions1[0]], [[]])
 
     functions1[2].visited = True
 
@@ -270,9 +305,7 @@ def test_visitor_down_with_visited_children(functions1):
          / \      / \
         1*  2*   1*  2*
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions1[0]], [[]])
 
     functions1[1].visited = True
     functions1[2].visited = True
@@ -293,9 +326,7 @@ def test_visitor_down_with_unvisited_child_and_grandchild(functions3):
       |          |
       2        ->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions3[0]], [[]])
 
     assert visitor.down() == functions3[2]
 
@@ -313,9 +344,7 @@ def test_visitor_down_with_unvisited_parent_and_child(functions3):
       |          |
       2        ->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0], functions3[1]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions3[0], functions3[1]], [[]])
 
     assert visitor.down() == functions3[2]
 
@@ -334,9 +363,7 @@ def test_visitor_down_without_children(functions3):
       |          |
     ->2        ->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0], functions3[1], functions3[2]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions3[0], functions3[1], functions3[2]], [[]])
 
     assert visitor.down() == None
 
@@ -354,9 +381,7 @@ def test_visitor_down_complex1(functions4):
          / \        / \
         3   4      3 ->4
     """
-    visitor = Visitor()
-    visitor.callstack = [functions4[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions4[0]], [[]])
 
     assert visitor.down() == functions4[4]
 
@@ -374,9 +399,7 @@ def test_visitor_down_complex2(functions4):
          / \        / \
         3   4*   ->3   4*
     """
-    visitor = Visitor()
-    visitor.callstack = [functions4[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions4[0]], [[]])
 
     functions4[4].visited = True
 
@@ -404,9 +427,7 @@ def test_visitor_up_with_unvisited_sibling(functions1):
        / \      / \
     ->1   2    1 ->2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0], functions1[1]]
-    visitor.queue = [[], [functions1[2]]]
+    visitor = init_visitor([functions1[0], functions1[1]], [[], [functions1[2]]])
 
     assert visitor.up() == functions1[2]
 
@@ -422,9 +443,7 @@ def test_visitor_up_with_visited_sibling1(functions1):
        / \      / \
     ->1   2*   1   2*
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0], functions1[1]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions1[0], functions1[1]], [[]])
 
     functions1[2].visited = True
 
@@ -443,9 +462,7 @@ def test_visitor_up_with_visited_sibling2(functions1):
        / \      / \
     ->1   2*   1   2*
     """
-    visitor = Visitor()
-    visitor.callstack = [functions1[0], functions1[1]]
-    visitor.queue = [[], functions1[2]]
+    visitor = init_visitor([functions1[0], functions1[1]], [[], functions1[2]])
 
     functions1[2].visited = True
 
@@ -465,9 +482,7 @@ def test_visitor_up_with_unvisited_parent_and_grandparent(functions3):
       |          |
     ->2          2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0], functions3[1], functions3[2]]
-    visitor.queue = [[], [], []]
+    visitor = init_visitor([functions3[0], functions3[1], functions3[2]], [[], [], []])
 
     assert visitor.up() == functions3[1]
 
@@ -485,9 +500,7 @@ def test_visitor_up_with_unvisited_parent_and_child(functions3):
       |          |
       2          2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0], functions3[1]]
-    visitor.queue = [[], []]
+    visitor = init_visitor([functions3[0], functions3[1]], [[], []])
 
     assert visitor.up() == functions3[0]
 
@@ -505,9 +518,7 @@ def test_visitor_up_without_parent(functions3):
       |          |
       2          2
     """
-    visitor = Visitor()
-    visitor.callstack = [functions3[0]]
-    visitor.queue = [[]]
+    visitor = init_visitor([functions3[0]], [[]])
 
     assert visitor.up() == None
 
@@ -515,6 +526,77 @@ def test_visitor_up_without_parent(functions3):
     assert visitor.queue == []
 
 
+def test_visitor_depth():
+    r"""Test Visitor.depth() while walking down and up a cycle.
+
+      0 <-
+      |   |
+      1 --
+    """
+    functions = [Stack.Function(address) for address in range(2)]
+    functions[0].calls = [functions[1]]
+    functions[1].calls = [functions[0]]
+
+    visitor = Visitor([functions[0]])
+    assert visitor.depth(functions[0]) == 0
+    assert visitor.depth(functions[1]) == None
+
+    assert visitor.down() == functions[0]
+    assert visitor.callstack == [functions[0], functions[1], functions[0]]
+    assert visitor.depth(functions[0]) == 0
+    assert visitor.depth(functions[1]) == 1
+
+    assert visitor.up() == functions[1]
+    assert visitor.depth(functions[0]) == 0
+    assert visitor.depth(functions[1]) == 1
+
+    assert visitor.up() == functions[0]
+    assert visitor.depth(functions[0]) == 0
+    assert visitor.depth(functions[1]) == None
+
+
+def test_stack_statistic_add_operation():
+    """Test Stack.Statistic.add_operation()."""
+    statistic = Stack.Statistic()
+
+    statistic.add_operation("mov", StackImpact.No)
+    statistic.add_operation("push", StackImpact.Clear)
+    statistic.add_operation("mov", StackImpact.Weak)
+
+    assert statistic.per_operations["mov"].executions == 2
+    assert statistic.per_operations["mov"].stack_impact == StackImpact.Weak
+    assert statistic.per_operations["push"].executions == 1
+    assert statistic.per_stack_impact[StackImpact.No] == 1
+    assert statistic.per_stack_impact[StackImpact.Clear] == 1
+    assert statistic.per_stack_impact[StackImpact.Weak] == 1
+    assert statistic.total_impacts == sum(statistic.per_stack_impact.values())
+
+    assert Stack.Statistic().total_impacts == 0
+
+
+def test_stack_statistic_add_operations():
+    """Test Stack.Statistic.add_operations()."""
+    statistic = Stack.Statistic()
+    statistic.add_operation("mov", StackImpact.No)
+
+    statistic.add_operations(
+        {
+            ("mov", StackImpact.Weak): 2,
+            ("push", StackImpact.Clear): 3,
+            ("mov", StackImpact.No): 4,
+        }
+    )
+
+    assert list(statistic.per_operations) == ["mov", "push"]
+    assert statistic.per_operations["mov"].executions == 7
+    assert statistic.per_operations["mov"].stack_impact == StackImpact.Weak
+    assert statistic.per_operations["push"].executions == 3
+    assert statistic.per_stack_impact[StackImpact.No] == 5
+    assert statistic.per_stack_impact[StackImpact.Clear] == 3
+    assert statistic.per_stack_impact[StackImpact.Weak] == 2
+    assert statistic.total_impacts == 10
+
+
 @pytest.mark.parametrize(
     "address, name, section, file, size",
     [
@@ -575,31 +657,41 @@ def test_stack_function__repr__(functions1):
 
 
 @pytest.mark.parametrize(
-    "operator, file1, address1, file2, address2",
-    itertools.product(
-        [
-            operator.__lt__,
-            operator.__gt__,
-            operator.__eq__,
-            operator.__le__,
-            operator.__ge__,
-            operator.__ne__,
-        ],
-        ["file_one", "file_two"],
-        [0, 1],
-        ["file_one", "file_two"],
-        [0, 1],
-    ),
+    "operator",
+    [
+        operator.__lt__,
+        operator.__gt__,
+        operator.__eq__,
+        operator.__le__,
+        operator.__ge__,
+        operator.__ne__,
+    ],
 )
-def test_stack_function_comparators(operator, file1, address1, file2, address2):
+def test_stack_function_comparators(operator):
     """Test all comperators of Stack.Function."""
-    function1 = Stack.Function(address1, file=file1)
-    function2 = Stack.Function(address2, file=file2)
+    # The combinations are cheap to check, so test them in one case per operator
+    for file1, address1, file2, address2 in itertools.product(
+        ["file_one", "file_two"], [0, 1], ["file_one", "file_two"], [0, 1]
+    ):
+        function1 = Stack.Function(address1, file=file1)
+        function2 = Stack.Function(address2, file=file2)
 
-    if file1 == file2:
-        assert operator(function1, function2) == operator(address1, address2)
-    else:
-        assert operator(function1, function2) == operator(file1, file2)
+        if file1 == file2:
+            expected = operator(address1, address2)
+        else:
+            expected = operator(file1, file2)
+
+        actual = operator(function1, function2)
+        assert actual == expected, (file1, address1, file2, address2)
+
+
+def test_stack_function__hash__():
+    """Test Stack.Function.__hash__()."""
+    function = Stack.Function(1, file="file_one")
+
+    assert hash(function) == hash(Stack.Function(1, file="file_one"))
+    assert {function, Stack.Function(1, file="file_one")} == {function}
+    assert len({function, Stack.Function(1, file="file_two")}) == 2
 
 
 def test_stack_table__init__(functions1):
@@ -707,6 +799,17 @@ def test_stack_table_find(functions1):
     assert table.find(1337) == None
 
 
+def test_stack_table_remove(functions1):
+    """Test Stack.Table.remove()."""
+    table = Stack.Table(functions1.copy())
+
+    table.remove([functions1[2], functions1[0]])
+    assert table.table == [functions1[1]]
+
+    table.remove([Stack.Function(1)])
+    assert table.table == [functions1[1]]
+
+
 def test_stack_table_sort(functions1):
     """Test Stack.Table.sort()."""
     init_value = [functions1[2], functions1[0], functions1[1]]
@@ -13,11 +13,9 @@ from stacklimit.output import Color, MessageType
 
 @pytest.mark.parametrize(
     "prefix, color",
-    itertools.chain(
-        itertools.product(
-            [None, "prefix", "test", ""],
-            [None, Color.YELLOW, Color.RED, Color.BOLD],
-        )
+    itertools.product(
+        [None, "prefix", "test", ""],
+        [None, Color.YELLOW, Color.RED, Color.BOLD],
     ),
 )
 def test_message_type__init__(prefix, color):
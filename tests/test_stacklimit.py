@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: 2022 CETITEC GmbH <https://www.cetitec.com>
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""Test cases for methods and classes defined in stacklimit.py file."""
+
+import pickle
+
+import pytest
+
+from stacklimit.stacklimit import (
+    Stack,
+    StackImpact,
+    Stacklimit,
+    _compile_pattern,
+    x86,
+    x86_64,
+)
+
+# Instruction lines with the kind of instruction expected for x86 and x86_64
+instructions = [
+    # fmt: off
+    ("  4004b2:\tcall   4005e9 <f>",   "FunctionCall",     "FunctionCall"),
+    ("  4004b2:\tcallq  4005e9 <f>",   "FunctionCall",     "FunctionCall"),
+    ("  4004b2:\tcall   *%rax",        "FunctionPointer",  "FunctionPointer"),
+    ("  4004b2:\tcallq  *0x8(%rax)",   "FunctionPointer",  "FunctionPointer"),
+    ("  4004c3:\tpush   %rbp",         "StackPushOp",      "StackPushOp"),
+    ("  4004c3:\tpushq  $0x0",         "PotentialStackOp", "StackPushOp"),
+    ("  4004c3:\tpushl  %esp",         "StackPushOp",      "PotentialStackOp"),
+    ("  4004aa:\tsub    $0x10,%rsp",   "StackSubOp",       "StackSubOp"),
+    ("  4004aa:\tsub    %rax,%rsp",    "StackDynamicOp",   "StackDynamicOp"),
+    ("  4004aa:\tenter  $0x10,$0x0",   "PotentialStackOp", "PotentialStackOp"),
+    ("  4004aa:\tfdecstp",             "PotentialStackOp", "PotentialStackOp"),
+    ("  4004aa:\tpushfq",              "PotentialStackOp", "PotentialStackOp"),
+    ("  4004aa:\tmov    %rsp,%rbp",    None,               None),
+    ("  4004aa:\tadd    $0x8,%rsp",    None,               None),
+    ("  4004aa:\tret",                 None,               None),
+    ("  4004aa:\tjmp    4005e9 <f>",   None,               None),
+    ("  4004aa:\tsubsd  %xmm1,%xmm0",  None,               None),
+    ("  4004aa:\tpop    %rbp",         None,               None),
+    # fmt: on
+]
+
+
+@pytest.fixture
+def stacklimit():
+    """Create a Stacklimit object without looking for objdump and readelf."""
+    # Skip Stacklimit.__init__(), since the cache doesn't need any tool
+    stacklimit = Stacklimit.__new__(Stacklimit)
+    stacklimit._init_color()
+
+    return stacklimit
+
+
+@pytest.fixture
+def stacktable():
+    r"""Initialize a stack table of 3 functions with statistic.
+
+        0
+       / \
+      1   2
+    """
+    functions = [
+        Stack.Function(0, name="main", section=".text", file="main.o", size=16),
+        Stack.Function(1, name="alpha", section=".text", file="main.o", size=8),
+        Stack.Function(2, name="beta", section=".init", file="beta.o", size=0),
+    ]
+    functions[2].dynamic = True
+
+    for callee in functions[1:]:
+        functions[0].calls.append(callee)
+        callee.returns.append(functions[0])
+
+    stacktable = Stack.Table(functions)
+    stacktable.statistic.add_operation("push", StackImpact.Clear)
+    stacktable.statistic.add_operation("call", StackImpact.Clear)
+    stacktable.statistic.add_operation("call", StackImpact.Weak)
+    stacktable.statistic.add_operation("mov", StackImpact.No)
+
+    return stacktable
+
+
+def test_stacklimit_cache(stacklimit, stacktable, tmp_path):
+    """Test Stacklimit._save_cache() and Stacklimit._load_cache()."""
+    path = str(tmp_path / "cache" / "binary.pickle")
+
+    stacklimit.stacktable = stacktable
+    stacklimit._save_cache(path)
+
+    stacklimit.stacktable = None
+    assert stacklimit._load_cache(path)
+
+    loaded = stacklimit.stacktable
+    assert loaded is not stacktable
+    assert len(loaded) == len(stacktable)
+    for function, expected in zip(loaded, stacktable):
+        assert function.address == expected.address
+        assert function.name == expected.name
+        assert function.section == expected.section
+        assert function.file == expected.file
+        assert function.size == expected.size
+        assert function.dynamic == expected.dynamic
+        assert [call.address for call in function.calls] == [
+            call.address for call in expected.calls
+        ]
+        assert [caller.address for caller in function.returns] == [
+            caller.address for caller in expected.returns
+        ]
+
+    # The calls have to reference the loaded functions and not copies of them
+    assert loaded[0].calls[0] is loaded[1]
+    assert loaded[2].returns[0] is loaded[0]
+
+    statistic = loaded.statistic
+    expected = stacktable.statistic
+    assert list(statistic.per_operations) == list(expected.per_operations)
+    for operation, operation_statistic in statistic.per_operations.items():
+        assert (
+            operation_statistic.executions
+            == expected.per_operations[operation].executions
+        )
+        assert (
+            operation_statistic.stack_impact
+            == expected.per_operations[operation].stack_impact
+        )
+    assert statistic.per_stack_impact == expected.per_stack_impact
+    assert statistic.total_impacts == expected.total_impacts == 4
+
+
+def test_stacklimit_cache_without_file(stacklimit, tmp_path):
+    """Test Stacklimit._load_cache() without a cache file."""
+    assert not stacklimit._load_cache(str(tmp_path / "binary.pickle"))
+    assert stacklimit.stacktable == None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"no pickle",
+        pickle.dumps(1),
+        pickle.dumps((1, 2, 3)),
+        pickle.dumps(([(0,)], [], {})),
+        pickle.dumps(([(0, "f", None, "", 0, False, [1], [])], [], {})),
+        pickle.dumps(([], [("mov", 1)], {})),
+        pickle.dumps(([], [], [])),
+    ],
+)
+def test_stacklimit_cache_with_corrupt_file(stacklimit, tmp_path, content):
+    """Test Stacklimit._load_cache() with a file, which isn't a valid cache."""
+    path = tmp_path / "binary.pickle"
+    path.write_bytes(content)
+
+    assert not stacklimit._load_cache(str(path))
+    assert stacklimit.stacktable == None
+
+
+@pytest.mark.parametrize("line, x86_kind, x86_64_kind", instructions)
+def test_compile_pattern_mnemonics(line, x86_kind, x86_64_kind):
+    """Test _compile_pattern() with and without searching the mnemonics first."""
+    for pattern, expected in [(x86, x86_kind), (x86_64, x86_64_kind)]:
+        (*_, match_instruction, search_mnemonic) = _compile_pattern(pattern)
+
+        match = match_instruction(line)
+        kind = match.lastgroup if match else None
+        assert kind == expected
+
+        # The search of the mnemonics must only skip lines without any match
+        match = match_instruction(line) if search_mnemonic(line) else None
+        assert (match.lastgroup if match else None) == kind